@@ -1,15 +1,48 @@
 """Public package interface for the VB6 parser-to-JSON toolchain."""
 
-from .config import ConverterConfig
-from .parser import ParseJob, ParserOutput, VB6ParserService
-from .serialization.json_serializer import JsonSerializer
-from .cli import main as cli_main
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cli import main as cli_main
+    from .config import ConverterConfig
+    from .parser import ParseJob, ParserOutput, ParserRuntime, VB6ParserService
+    from .serialization.json_serializer import JsonSerializer
+
+# Exports are resolved on first access so that `import vb6_antlr` (and the
+# CLI's `--help` path) does not pay for loading the ANTLR runtime.
+_EXPORTS: dict[str, tuple[str, str]] = {
+    "ConverterConfig": (".config", "ConverterConfig"),
+    "ParseJob": (".parser", "ParseJob"),
+    "ParserOutput": (".parser", "ParserOutput"),
+    "ParserRuntime": (".parser", "ParserRuntime"),
+    "VB6ParserService": (".parser", "VB6ParserService"),
+    "JsonSerializer": (".serialization.json_serializer", "JsonSerializer"),
+    "cli_main": (".cli", "main"),
+}
 
 __all__ = [
     "ConverterConfig",
     "ParseJob",
     "ParserOutput",
+    "ParserRuntime",
     "VB6ParserService",
     "JsonSerializer",
     "cli_main",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,103 @@
+"""On-disk cache of built IR modules, keyed by source content.
+
+Entries are pickled `IRModule` objects stored under `$XDG_CACHE_HOME/vb6_antlr`
+(or `~/.cache/vb6_antlr`). Parse trees are not cached: they are bound to
+their token stream and do not pickle cleanly, while the IR does.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ir import IRModule
+
+
+# Bump when the IR builder changes what it produces for the same parse tree.
+_CACHE_FORMAT = b"4"
+
+
+def cache_dir() -> Path:
+    """Return the directory holding cache entries (not necessarily created)."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base) / "vb6_antlr"
+
+
+def make_key(
+    source_path: Path, text: str, *, metadata_only: bool, schema_version: str
+) -> str:
+    """Return the cache key for converting `text` read from `source_path`.
+
+    The path is part of the key because the cached module and its
+    diagnostics record it. The grammar tag invalidates entries whenever the
+    generated recognizers are regenerated.
+    """
+
+    digest = hashlib.blake2b(digest_size=20)
+    for part in (
+        _CACHE_FORMAT,
+        _grammar_tag(),
+        schema_version.encode("utf-8"),
+        b"m" if metadata_only else b"f",
+        os.fsencode(source_path),
+        text.encode("utf-8"),
+    ):
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def load(key: str) -> IRModule | None:
+    """Return the cached module for `key`, or None on a miss or bad entry."""
+
+    from .ir import IRModule
+
+    try:
+        with open(cache_dir() / f"{key}.pkl", "rb") as handle:
+            module = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or stale entries behave like misses and are overwritten.
+        # Stale ones can fail anywhere in unpickling, e.g. with a TypeError
+        # when a record's constructor no longer takes the pickled arguments.
+        return None
+    return module if isinstance(module, IRModule) else None
+
+
+def store(key: str, module: IRModule) -> None:
+    """Persist `module` under `key`; failures only cost a future cache miss."""
+
+    directory = cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(module, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            # Readers never observe a partially written entry.
+            os.replace(temp_name, directory / f"{key}.pkl")
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+    except (OSError, pickle.PicklingError):
+        return
+
+
+@cache
+def _grammar_tag() -> bytes:
+    from vb6_grammar.grammars import VisualBasic6Lexer, VisualBasic6Parser
+
+    digest = hashlib.blake2b(digest_size=16)
+    for module in (VisualBasic6Lexer, VisualBasic6Parser):
+        digest.update(",".join(map(str, module.serializedATN())).encode("ascii"))
+    return digest.digest()
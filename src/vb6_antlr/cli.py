@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Sequence, TextIO, overload
 
 from .config import ConverterConfig
-from .ir import IRBuilder, IRModule
-from .parser import VB6ParserService
-from .serialization import JsonSerializer
+
+if TYPE_CHECKING:
+    from .ir import IRModule
+    from .serialization import JsonSerializer
 
 
 class FileOutputWriter:
@@ -27,6 +29,13 @@ class FileOutputWriter:
         return True
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def build_argument_parser() -> argparse.ArgumentParser:
     """Return the CLI argument parser used by `main`."""
 
@@ -41,37 +50,99 @@ def build_argument_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--fail-fast", action="store_true", help="Stop after the first fatal error"
     )
+    parser.add_argument(
+        "--max-workers",
+        type=_positive_int,
+        default=None,
+        help="Number of parser processes (defaults to the CPU count)",
+    )
+    parser.add_argument(
+        "--metadata-only",
+        action="store_true",
+        help=(
+            "Skip routine bodies; only module metadata and signatures are needed. "
+            "Syntax errors inside routine bodies are not reported in this mode"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every input instead of reusing cached results for unchanged files",
+    )
     return parser
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    """CLI entry point. Returns an exit code for the host process."""
+@overload
+def main(
+    argv: Sequence[str] | None = None,
+    *,
+    out: TextIO | None = None,
+    return_payload: Literal[False] = False,
+) -> int:
+    ...
+
+
+@overload
+def main(
+    argv: Sequence[str] | None = None,
+    *,
+    out: TextIO | None = None,
+    return_payload: Literal[True],
+) -> tuple[int, list[dict[str, Any]]]:
+    ...
+
+
+def main(
+    argv: Sequence[str] | None = None,
+    *,
+    out: TextIO | None = None,
+    return_payload: bool = False,
+) -> int | tuple[int, list[dict[str, Any]]]:
+    """CLI entry point. Returns an exit code for the host process.
+
+    Without `--output`, JSON is written to `out` (default `sys.stdout`).
+    Programmatic callers can pass `return_payload=True` to get
+    `(exit_code, payloads)` instead, one JSON-ready dict per module. The
+    stream output is then skipped, but `--output` files are still written.
+    """
 
     parser = build_argument_parser()
     args = parser.parse_args(list(argv) if argv is not None else None)
 
+    # Deferred until the arguments are valid: these pull in the ANTLR runtime
+    # and generated parser, which `--help` and usage errors never need.
+    from .parser import VB6ParserService
+    from .serialization import JsonSerializer
+
     config = ConverterConfig.from_paths(
         args.inputs,
         output_dir=args.output,
         schema_version=args.schema_version,
-    ).with_updates(fail_fast=args.fail_fast)
+    ).with_updates(
+        fail_fast=args.fail_fast,
+        max_workers=args.max_workers,
+        metadata_only=args.metadata_only,
+        use_cache=not args.no_cache,
+    )
 
     service = VB6ParserService(config)
     jobs = service.build_jobs()
-    parser_outputs = service.parse(jobs)
+    modules = service.convert(jobs)
 
-    builder = IRBuilder()
-    modules = [builder.build(output) for output in parser_outputs]
-
-    serializer = JsonSerializer()
+    serializer = JsonSerializer(
+        fast_json=config.fast_json, workers=config.serialize_workers
+    )
+    exit_code = 0
     if config.output_dir:
         writer = FileOutputWriter(serializer, config.output_dir)
-        success = writer.write_all(modules)
-        return 0 if success else 1
-
-    for module in modules:
-        print(serializer.dumps(module))
-    return 0
+        exit_code = 0 if writer.write_all(modules) else 1
+    elif not return_payload:
+        stream = out if out is not None else sys.stdout
+        stream.write("".join(f"{serializer.dumps(module)}\n" for module in modules))
+
+    if return_payload:
+        return exit_code, [serializer.to_payload(module) for module in modules]
+    return exit_code
 
 
 if __name__ == "__main__":  # pragma: no cover - manual invocation helper
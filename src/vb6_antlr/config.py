@@ -2,43 +2,68 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+import os
+import sys
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator
 
 
 DEFAULT_SCHEMA_VERSION = "1.0.0"
+SOURCE_EXTENSIONS = frozenset({"bas", "cls", "frm"})
+# File suffix -> module kind, used when the source carries no header to go by.
+MODULE_KINDS: dict[str, str] = {
+    suffix: sys.intern(kind)
+    for suffix, kind in {
+        ".bas": "standard",
+        ".cls": "class",
+        ".frm": "form",
+        ".ctl": "control",
+    }.items()
+}
+DEFAULT_MODULE_KIND = MODULE_KINDS[".bas"]
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class ConverterConfig:
-    """High-level configuration for a conversion run."""
+    """High-level configuration for a conversion run.
 
-    inputs: Sequence[Path]
+    Instances are immutable and hashable; derive variants with `with_updates`.
+    """
+
+    inputs: tuple[Path, ...]
     output_dir: Path | None = None
     schema_version: str = DEFAULT_SCHEMA_VERSION
     fail_fast: bool = False
     include_forms: bool = True
     include_comments: bool = True
-    extra_options: dict[str, str] = field(default_factory=dict)
+    max_workers: int | None = None
+    parallel_threshold: int = 4
+    metadata_only: bool = False
+    fast_json: bool = True
+    serialize_workers: int | None = None
+    use_cache: bool = False
+    extra_options: dict[str, str] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.inputs, tuple):
+            object.__setattr__(self, "inputs", tuple(self.inputs))
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {self.max_workers}")
 
     def resolve_inputs(self) -> list[Path]:
         """Expand provided inputs into a sorted list of VB6 source files."""
 
-        files: list[Path] = []
-        allowed_suffixes = {".bas", ".cls", ".frm"}
+        found: set[str] = set()
         for path in self.inputs:
             if path.is_dir():
-                files.extend(
-                    sorted(
-                        p
-                        for p in path.rglob("*")
-                        if p.suffix.lower() in allowed_suffixes
-                    )
-                )
-            elif path.suffix.lower() in allowed_suffixes:
-                files.append(path)
-        return sorted({p.resolve() for p in files})
+                found.update(_walk_sources(os.fspath(path)))
+            elif _is_source_name(path.name):
+                found.add(os.fspath(path))
+        # Anchor relative paths first so cached resolutions stay cwd-independent.
+        cwd = os.getcwd()
+        return sorted({_resolve_path(os.path.join(cwd, p)) for p in found})
 
     @classmethod
     def from_paths(
@@ -50,7 +75,7 @@ class ConverterConfig:
     ) -> "ConverterConfig":
         """Convenience constructor used by CLI/bootstrap code."""
 
-        resolved_inputs = [Path(p) for p in inputs]
+        resolved_inputs = tuple(Path(p) for p in inputs)
         resolved_output = Path(output_dir) if output_dir is not None else None
         return cls(
             inputs=resolved_inputs,
@@ -61,6 +86,46 @@ class ConverterConfig:
     def with_updates(self, **overrides: object) -> "ConverterConfig":
         """Return a copy of the configuration with selective overrides."""
 
-        data = asdict(self)
-        data.update(overrides)
-        return ConverterConfig(**data)  # type: ignore[arg-type]
+        if "extra_options" not in overrides:
+            # The options dict is the one mutable field; keep copies independent.
+            overrides["extra_options"] = dict(self.extra_options)
+        return replace(self, **overrides)  # type: ignore[arg-type]
+
+
+def module_kind_for(path: Path) -> str:
+    """Return the module kind implied by the file suffix of `path`."""
+
+    return MODULE_KINDS.get(path.suffix.lower(), DEFAULT_MODULE_KIND)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_path(path: str) -> Path:
+    """Resolve absolute `path` once per process, skipping repeat realpath calls."""
+
+    return Path(path).resolve()
+
+
+def _is_source_name(name: str) -> bool:
+    """Return True when a file name carries a VB6 source extension."""
+
+    stem, dot, extension = name.rpartition(".")
+    # Mirror `Path.suffix`: dotfiles such as ".bas" have no suffix.
+    return bool(dot and stem) and extension.lower() in SOURCE_EXTENSIONS
+
+
+def _walk_sources(root: str) -> Iterator[str]:
+    """Yield VB6 source paths below `root` without following symlinks."""
+
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif _is_source_name(entry.name):
+                        yield entry.path
+        except OSError:
+            # Unreadable directories are skipped, as `Path.rglob` did.
+            continue
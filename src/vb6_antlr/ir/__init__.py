@@ -1,5 +1,57 @@
 """Intermediate representation scaffolding for VB6 constructs."""
 
-from .builder import IRBuilder, IRModule
+from __future__ import annotations
 
-__all__ = ["IRBuilder", "IRModule"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .builder import (
+        AttributeRecord,
+        IRBuilder,
+        IRModule,
+        MemberRecord,
+        ModuleRecord,
+        OptionRecord,
+        ParameterRecord,
+    )
+    from .members import MembersView
+
+# Exports are resolved on first access, so this package is fully imported
+# before `builder` loads. A mypyc-compiled `builder` looks itself up through
+# `vb6_antlr.ir` while initializing and cannot load from inside this file.
+_EXPORTS: dict[str, tuple[str, str]] = {
+    "AttributeRecord": (".builder", "AttributeRecord"),
+    "IRBuilder": (".builder", "IRBuilder"),
+    "IRModule": (".builder", "IRModule"),
+    "MemberRecord": (".builder", "MemberRecord"),
+    "MembersView": (".members", "MembersView"),
+    "ModuleRecord": (".builder", "ModuleRecord"),
+    "OptionRecord": (".builder", "OptionRecord"),
+    "ParameterRecord": (".builder", "ParameterRecord"),
+}
+
+__all__ = [
+    "AttributeRecord",
+    "IRBuilder",
+    "IRModule",
+    "MemberRecord",
+    "MembersView",
+    "ModuleRecord",
+    "OptionRecord",
+    "ParameterRecord",
+]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
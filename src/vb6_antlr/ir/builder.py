@@ -2,200 +2,526 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import re
+import sys
+import weakref
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Final
 
-from antlr4 import ParseTreeWalker, ParserRuleContext
+from antlr4 import CommonTokenStream, ParserRuleContext
 
-from ..config import DEFAULT_SCHEMA_VERSION
+from ..config import DEFAULT_MODULE_KIND, DEFAULT_SCHEMA_VERSION, module_kind_for
 from ..diagnostics import Diagnostic
-from ..parser import ParserOutput
+from ..parser import ParserOutput, Preamble
+from .members import MembersView
 from vb6_grammar.grammars.VisualBasic6Parser import VisualBasic6Parser
 from vb6_grammar.grammars.VisualBasic6ParserListener import (
     VisualBasic6ParserListener,
 )
 
 
-@dataclass(slots=True)
+_INT_LITERAL: Final = re.compile(r"[-+]?[0-9]+")
+_FLOAT_LITERAL: Final = re.compile(
+    r"[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?"
+)
+_LITERAL_CONSTANTS: Final[dict[str, bool]] = {"true": True, "false": False}
+
+_RoutineContext = (
+    VisualBasic6Parser.SubStmtContext
+    | VisualBasic6Parser.FunctionStmtContext
+    | VisualBasic6Parser.PropertyGetStmtContext
+    | VisualBasic6Parser.PropertyLetStmtContext
+    | VisualBasic6Parser.PropertySetStmtContext
+)
+_ROUTINE_TYPES: Final[frozenset[type]] = frozenset(
+    {
+        VisualBasic6Parser.SubStmtContext,
+        VisualBasic6Parser.FunctionStmtContext,
+        VisualBasic6Parser.PropertyGetStmtContext,
+        VisualBasic6Parser.PropertyLetStmtContext,
+        VisualBasic6Parser.PropertySetStmtContext,
+    }
+)
+# Structural rules that can contain module metadata or routine declarations.
+# Everything else (statements, expressions, type/enum bodies) is pruned.
+_CONTAINER_TYPES: Final[frozenset[type]] = frozenset(
+    {
+        VisualBasic6Parser.StartRuleContext,
+        VisualBasic6Parser.ModuleContext,
+        VisualBasic6Parser.ModuleAttributesContext,
+        VisualBasic6Parser.ModuleOptionsContext,
+        VisualBasic6Parser.ModuleBodyContext,
+        VisualBasic6Parser.ModuleBodyElementContext,
+        VisualBasic6Parser.ModuleBlockContext,
+        VisualBasic6Parser.BlockContext,
+        VisualBasic6Parser.BlockStmtContext,
+        VisualBasic6Parser.MacroIfThenElseStmtContext,
+        VisualBasic6Parser.MacroIfBlockStmtContext,
+        VisualBasic6Parser.MacroElseIfBlockStmtContext,
+        VisualBasic6Parser.MacroElseBlockStmtContext,
+    }
+)
+
+
+# Shared string objects for values repeated across every IR record.
+_KIND_SUB: Final = sys.intern("sub")
+_KIND_FUNCTION: Final = sys.intern("function")
+_KIND_PROPERTY_GET: Final = sys.intern("propertyGet")
+_KIND_PROPERTY_LET: Final = sys.intern("propertyLet")
+_KIND_PROPERTY_SET: Final = sys.intern("propertySet")
+_KIND_PRIVATE_MODULE: Final = sys.intern("privateModule")
+_MOD_STATIC: Final = sys.intern("Static")
+_MOD_OPTIONAL: Final = sys.intern("Optional")
+_MOD_PARAMARRAY: Final = sys.intern("ParamArray")
+_MOD_BYVAL: Final = sys.intern("ByVal")
+_MOD_BYREF: Final = sys.intern("ByRef")
+# Visibility keyword as written -> interned lower-case form.
+_VISIBILITY_CACHE: Final[dict[str, str]] = {
+    keyword: sys.intern(keyword.lower())
+    for keyword in ("Private", "Public", "Friend", "Global")
+}
+
+_TYPED_MEMBER_KINDS: Final[frozenset[str]] = frozenset(
+    {_KIND_FUNCTION, _KIND_PROPERTY_GET}
+)
+_FLAG_OPTIONS: Final[frozenset[str]] = frozenset({"explicit", "privateModule"})
+
+
+def _reduce_record(record: Any) -> tuple[type, tuple[Any, ...]]:
+    """Pickle a frozen record by its constructor arguments.
+
+    Under mypyc the records lose the `__setstate__` that `slots=True` adds,
+    and the default one trips the frozen guard; rebuilding through
+    `__init__` works compiled or not.
+    """
+
+    return type(record), tuple(
+        getattr(record, item.name) for item in fields(record) if item.init
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeRecord:
+    """An `Attribute Name = value, ...` statement."""
+
+    name: str
+    values: list[Any]
+    location: dict[str, int] | None
+    raw: str
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dictionary representation."""
+
+        return {
+            "name": self.name,
+            "values": self.values,
+            "location": self.location,
+            "raw": self.raw,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class OptionRecord:
+    """A module-level `Option` directive."""
+
+    option_type: str
+    value: Any
+    location: dict[str, int] | None
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dictionary representation."""
+
+        record: dict[str, Any] = {"type": self.option_type, "location": self.location}
+        if self.value is not None:
+            record["value"] = self.value
+        return record
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterRecord:
+    """A single routine parameter."""
+
+    name: str | None
+    modifiers: list[str]
+    type_name: str | None
+    type_hint: str | None
+    default_value: Any = None
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dictionary representation."""
+
+        return {
+            "name": self.name,
+            "modifiers": self.modifiers,
+            "type": self.type_name,
+            "typeHint": self.type_hint,
+            "defaultValue": self.default_value,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class MemberRecord:
+    """A Sub, Function or Property routine signature."""
+
+    kind: str
+    name: str | None
+    visibility: str | None
+    modifiers: list[str]
+    parameters: list[ParameterRecord]
+    start_line: int | None
+    end_line: int | None
+    return_type: str | None = None
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dictionary representation."""
+
+        member: dict[str, Any] = {
+            "kind": self.kind,
+            "name": self.name,
+            "visibility": self.visibility,
+            "modifiers": self.modifiers,
+            "parameters": [p.to_dict() for p in self.parameters],
+            "startLine": self.start_line,
+            "endLine": self.end_line,
+        }
+        if self.kind in _TYPED_MEMBER_KINDS:
+            member["returnType"] = self.return_type
+        return member
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleRecord:
+    """Module-level metadata plus the collected declarations."""
+
+    name: str
+    kind: str
+    attributes: list[AttributeRecord] = field(default_factory=list)
+    options: list[OptionRecord] = field(default_factory=list)
+    members: list[MemberRecord] = field(default_factory=list)
+    is_private_module: bool | None = None
+    version: str | None = None
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly dictionary representation."""
+
+        module: dict[str, Any] = {
+            "name": self.name,
+            "kind": self.kind,
+            "attributes": [a.to_dict() for a in self.attributes],
+            "options": [o.to_dict() for o in self.options],
+            "members": MembersView(m.to_dict() for m in self.members),
+        }
+        if self.is_private_module is not None:
+            module["isPrivateModule"] = self.is_private_module
+        if self.version is not None:
+            module["version"] = self.version
+        return module
+
+
+@dataclass(frozen=True, slots=True)
 class IRModule:
     """Intermediary representation for a parsed VB6 module."""
 
     source_path: Path
-    body: dict[str, Any] = field(default_factory=dict)
-    diagnostics: list[Diagnostic] = field(default_factory=list)
+    module: ModuleRecord
+    diagnostics: tuple[Diagnostic, ...] = ()
+    schema_version: str = DEFAULT_SCHEMA_VERSION
+    _body: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return _reduce_record(self)
+
+    @property
+    def body(self) -> dict[str, Any]:
+        """JSON-ready view of the module, built from the records on first use."""
+
+        body = self._body
+        if body is None:
+            body = {
+                "schemaVersion": self.schema_version,
+                "module": self.module.to_dict(),
+            }
+            # A derived cache, not state: bypass the frozen guard to store it.
+            object.__setattr__(self, "_body", body)
+        return body
 
 
 class ModuleCollector(VisualBasic6ParserListener):
-    """Listener that projects parse tree nodes into structured module data."""
+    """Projects parse tree nodes into structured module data.
+
+    Drive it with `collect`; the `exit*` callbacks keep the listener
+    signatures, so it also still works under a `ParseTreeWalker`.
+    """
 
-    def __init__(self, source_path: Path) -> None:
+    def __init__(
+        self,
+        source_path: Path,
+        token_stream: CommonTokenStream | None = None,
+        preamble: Preamble | None = None,
+    ) -> None:
         self.source_path = source_path
+        self._tokens = token_stream
         self.module_name: str | None = None
         self.module_version: str | None = None
         self.header_kind: str | None = None
-        self.attributes: list[dict[str, Any]] = []
-        self.options: list[dict[str, Any]] = []
-        self.members: list[dict[str, Any]] = []
+        self.attributes: list[AttributeRecord] = []
+        self.options: list[OptionRecord] = []
+        self.members: list[MemberRecord] = []
         self.is_private_module: bool = False
-        self._option_seen: set[tuple[str, Any]] = set()
+        self._option_seen: set[object] = set()
+        if preamble is not None:
+            self._apply_preamble(preamble)
+
+    def collect(self, tree: ParserRuleContext) -> None:
+        """Visit the declaration-bearing nodes of `tree` in document order.
+
+        An explicit stack replaces `ParseTreeWalker` recursion, and only the
+        structural rules are descended into. Routines are entered solely to
+        reach the statements of their body, where member attributes such as
+        `VB_UserMemId` live. Other rules are pruned unless their token range
+        holds an `Attribute` keyword, so attributes nested in statements are
+        still collected, as a full listener walk would.
+        """
+
+        handlers = _HANDLERS
+        attribute_at = self._attribute_token_indexes()
+        stack: list[Any] = [tree]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(self, node)
+                if node_type not in _ROUTINE_TYPES:
+                    continue
+            elif node_type not in _CONTAINER_TYPES:
+                start = getattr(node, "start", None)
+                if start is None:
+                    continue
+                if attribute_at is not None:
+                    stop = node.stop
+                    position = bisect_left(attribute_at, start.tokenIndex)
+                    if position == len(attribute_at) or (
+                        stop is None or attribute_at[position] > stop.tokenIndex
+                    ):
+                        continue
+            children = node.children
+            if children:
+                stack.extend(reversed(children))
+
+    def _attribute_token_indexes(self) -> list[int] | None:
+        """Return the sorted stream indexes of `Attribute` keywords.
+
+        None means no token stream is available; `collect` then descends
+        every rule node instead of pruning.
+        """
+
+        tokens = self._tokens
+        if tokens is None:
+            return None
+        attribute = VisualBasic6Parser.ATTRIBUTE
+        return [token.tokenIndex for token in tokens.tokens if token.type == attribute]
 
     # --- Module level -----------------------------------------------------
 
     def exitModuleHeader(self, ctx: VisualBasic6Parser.ModuleHeaderContext) -> None:
-        if ctx.doubleLiteral():
-            self.module_version = ctx.doubleLiteral().getText()
+        version = ctx.doubleLiteral()
+        if version:
+            self.module_version = self._text(version)
         if ctx.CLASS():
             self.header_kind = "class"
 
     def exitAttributeStmt(self, ctx: VisualBasic6Parser.AttributeStmtContext) -> None:
-        name = ctx.implicitCallStmt_InStmt().getText()
         values = [
-            self._normalize_literal(literal.getText()) for literal in ctx.literal()
+            self._normalize_literal(self._text(literal)) for literal in ctx.literal()
         ]
-        record = {
-            "name": name,
-            "values": values,
-            "location": self._location(ctx),
-            "raw": ctx.getText(),
-        }
-        self.attributes.append(record)
-        if name.lower() == "vb_name" and values:
-            # First VB_Name literal defines the module's logical name.
-            self.module_name = str(values[0])
+        self._add_attribute(
+            self._text(ctx.implicitCallStmt_InStmt()),
+            values,
+            self._location(ctx),
+            self._text(ctx),
+        )
 
     def exitOptionBaseStmt(self, ctx: VisualBasic6Parser.OptionBaseStmtContext) -> None:
-        value = (
-            self._normalize_literal(ctx.integerLiteral().getText())
-            if ctx.integerLiteral()
-            else None
-        )
-        self._add_option("base", value, ctx)
+        literal = ctx.integerLiteral()
+        value = self._normalize_literal(self._text(literal)) if literal else None
+        self._add_option("base", value, self._location(ctx))
 
     def exitOptionCompareStmt(
         self, ctx: VisualBasic6Parser.OptionCompareStmtContext
     ) -> None:
         mode = "binary" if ctx.BINARY() else "text"
-        self._add_option("compare", mode, ctx)
+        self._add_option("compare", mode, self._location(ctx))
 
     def exitOptionExplicitStmt(
         self, ctx: VisualBasic6Parser.OptionExplicitStmtContext
     ) -> None:
-        self._add_option("explicit", True, ctx)
+        self._add_option("explicit", True, self._location(ctx))
 
     def exitOptionPrivateModuleStmt(
         self, ctx: VisualBasic6Parser.OptionPrivateModuleStmtContext
     ) -> None:
         self.is_private_module = True
-        self._add_option("privateModule", True, ctx)
+        self._add_option("privateModule", True, self._location(ctx))
 
     # --- Routine declarations ---------------------------------------------
 
     def exitSubStmt(self, ctx: VisualBasic6Parser.SubStmtContext) -> None:
-        self.members.append(self._build_routine(ctx, kind="sub"))
+        self.members.append(self._build_routine(ctx, kind=_KIND_SUB))
 
     def exitFunctionStmt(self, ctx: VisualBasic6Parser.FunctionStmtContext) -> None:
-        member = self._build_routine(ctx, kind="function")
-        member["returnType"] = self._normalize_type_clause(ctx.asTypeClause())
-        self.members.append(member)
+        self.members.append(
+            self._build_routine(
+                ctx,
+                kind=_KIND_FUNCTION,
+                return_type=self._normalize_type_clause(ctx.asTypeClause()),
+            )
+        )
 
     def exitPropertyGetStmt(
         self, ctx: VisualBasic6Parser.PropertyGetStmtContext
     ) -> None:
-        member = self._build_routine(ctx, kind="propertyGet")
-        member["returnType"] = self._normalize_type_clause(ctx.asTypeClause())
-        self.members.append(member)
+        self.members.append(
+            self._build_routine(
+                ctx,
+                kind=_KIND_PROPERTY_GET,
+                return_type=self._normalize_type_clause(ctx.asTypeClause()),
+            )
+        )
 
     def exitPropertyLetStmt(
         self, ctx: VisualBasic6Parser.PropertyLetStmtContext
     ) -> None:
-        self.members.append(self._build_routine(ctx, kind="propertyLet"))
+        self.members.append(self._build_routine(ctx, kind=_KIND_PROPERTY_LET))
 
     def exitPropertySetStmt(
         self, ctx: VisualBasic6Parser.PropertySetStmtContext
     ) -> None:
-        self.members.append(self._build_routine(ctx, kind="propertySet"))
+        self.members.append(self._build_routine(ctx, kind=_KIND_PROPERTY_SET))
 
     # --- Helpers ----------------------------------------------------------
 
+    def _apply_preamble(self, preamble: Preamble) -> None:
+        """Record directives the parser read ahead, as the walk would have."""
+
+        for attribute in preamble.attributes:
+            self._add_attribute(
+                attribute.name,
+                [self._normalize_literal(attribute.literal)],
+                {"line": attribute.line, "column": attribute.column},
+                attribute.raw,
+            )
+        for option in preamble.options:
+            self._add_option(
+                option.option_type,
+                option.value,
+                {"line": option.line, "column": option.column},
+            )
+
+    def _add_attribute(
+        self,
+        name: str,
+        values: list[Any],
+        location: dict[str, int] | None,
+        raw: str,
+    ) -> None:
+        self.attributes.append(
+            AttributeRecord(name=name, values=values, location=location, raw=raw)
+        )
+        if name.lower() == "vb_name" and values:
+            # First VB_Name literal defines the module's logical name.
+            self.module_name = str(values[0])
+
     def _add_option(
         self,
         option_type: str,
         value: Any,
-        ctx: VisualBasic6Parser.ModuleOptionContext,
+        location: dict[str, int] | None,
     ) -> None:
-        key = (option_type, self._hashable(value))
+        # Flag options carry no value; Base/Compare values are scalar literals.
+        key = option_type if option_type in _FLAG_OPTIONS else (option_type, value)
         if key in self._option_seen:
             return
-        record: dict[str, Any] = {"type": option_type, "location": self._location(ctx)}
-        if value is not None:
-            record["value"] = value
-        self.options.append(record)
+        self.options.append(
+            OptionRecord(option_type=option_type, value=value, location=location)
+        )
         self._option_seen.add(key)
 
-    def _build_routine(self, ctx: ParserRuleContext, *, kind: str) -> dict[str, Any]:
-        name = (
-            ctx.ambiguousIdentifier().getText()
-            if hasattr(ctx, "ambiguousIdentifier") and ctx.ambiguousIdentifier()
-            else None
-        )
-        visibility = self._normalize_visibility(
-            ctx.visibility().getText()
-            if hasattr(ctx, "visibility") and ctx.visibility()
-            else None
-        )
+    def _build_routine(
+        self, ctx: _RoutineContext, *, kind: str, return_type: str | None = None
+    ) -> MemberRecord:
+        # Every routine context exposes the same header accessors, so the
+        # children can be looked up directly; each lookup scans ctx.children.
+        identifier = ctx.ambiguousIdentifier()
+        visibility = ctx.visibility()
+        arg_list = ctx.argList()
         modifiers: list[str] = []
-        if hasattr(ctx, "STATIC") and ctx.STATIC():
-            modifiers.append("Static")
-        parameters = (
-            self._collect_parameters(ctx.argList())
-            if hasattr(ctx, "argList") and ctx.argList()
-            else []
+        if ctx.STATIC():
+            modifiers.append(_MOD_STATIC)
+        start, stop = ctx.start, ctx.stop
+        return MemberRecord(
+            kind=kind,
+            name=self._text(identifier) if identifier else None,
+            visibility=self._normalize_visibility(
+                self._text(visibility) if visibility else None
+            ),
+            modifiers=modifiers,
+            parameters=self._collect_parameters(arg_list) if arg_list else [],
+            start_line=start.line if start else None,
+            end_line=stop.line if stop else None,
+            return_type=return_type,
         )
-        member = {
-            "kind": kind,
-            "name": name,
-            "visibility": visibility,
-            "modifiers": modifiers,
-            "parameters": parameters,
-            "startLine": ctx.start.line if getattr(ctx, "start", None) else None,
-            "endLine": ctx.stop.line if getattr(ctx, "stop", None) else None,
-        }
-        return member
 
     def _collect_parameters(
         self, arg_list: VisualBasic6Parser.ArgListContext
-    ) -> list[dict[str, Any]]:
-        params: list[dict[str, Any]] = []
+    ) -> list[ParameterRecord]:
+        params: list[ParameterRecord] = []
         for arg in arg_list.arg():
-            name = (
-                arg.ambiguousIdentifier().getText()
-                if arg.ambiguousIdentifier()
-                else None
-            )
+            identifier = arg.ambiguousIdentifier()
+            type_hint = arg.typeHint()
+            default_value = arg.argDefaultValue()
             modifiers: list[str] = []
             if arg.OPTIONAL():
-                modifiers.append("Optional")
+                modifiers.append(_MOD_OPTIONAL)
             if arg.PARAMARRAY():
-                modifiers.append("ParamArray")
+                modifiers.append(_MOD_PARAMARRAY)
             if arg.BYVAL():
-                modifiers.append("ByVal")
+                modifiers.append(_MOD_BYVAL)
             if arg.BYREF():
-                modifiers.append("ByRef")
-            param: dict[str, Any] = {
-                "name": name,
-                "modifiers": modifiers,
-                "type": self._normalize_type_clause(arg.asTypeClause()),
-                "typeHint": arg.typeHint().getText() if arg.typeHint() else None,
-                "defaultValue": None,
-            }
-            if arg.argDefaultValue():
-                value_stmt = arg.argDefaultValue().valueStmt()
-                if value_stmt:
-                    param["defaultValue"] = self._normalize_literal(
-                        value_stmt.getText()
-                    )
-            params.append(param)
+                modifiers.append(_MOD_BYREF)
+            value_stmt = default_value.valueStmt() if default_value else None
+            params.append(
+                ParameterRecord(
+                    name=self._text(identifier) if identifier else None,
+                    modifiers=modifiers,
+                    type_name=self._normalize_type_clause(arg.asTypeClause()),
+                    type_hint=self._text(type_hint) if type_hint else None,
+                    default_value=(
+                        self._normalize_literal(self._text(value_stmt))
+                        if value_stmt
+                        else None
+                    ),
+                )
+            )
         return params
 
     @staticmethod
@@ -203,42 +529,51 @@ class ModuleCollector(VisualBasic6ParserListener):
         raw = text.strip()
         if not raw:
             return raw
-        lowered = raw.lower()
-        if lowered == "true":
-            return True
-        if lowered == "false":
-            return False
-        if (raw.startswith('"') and raw.endswith('"')) or (
-            raw.startswith("'") and raw.endswith("'")
-        ):
-            inner = raw[1:-1].replace('""', '"').replace("''", "'")
-            return inner
-        try:
-            if "#" in raw or raw.startswith("&"):
-                raise ValueError
+        constant = _LITERAL_CONSTANTS.get(raw.lower())
+        if constant is not None:
+            return constant
+        quote = raw[0]
+        if quote in "\"'" and raw[-1] == quote:
+            return raw[1:-1].replace('""', '"').replace("''", "'")
+        # Hex/octal (`&H`), date (`#...#`) and suffixed literals stay raw.
+        if _INT_LITERAL.fullmatch(raw):
             return int(raw)
-        except ValueError:
-            try:
-                return float(raw)
-            except ValueError:
-                return raw
+        if _FLOAT_LITERAL.fullmatch(raw):
+            return float(raw)
+        return raw
+
+    def _text(self, ctx: ParserRuleContext) -> str:
+        """Return the source text of `ctx`.
+
+        Slicing the token stream over `ctx.start..ctx.stop` avoids the
+        recursive child concatenation of `ctx.getText()`. No tokens sit on
+        hidden channels in this grammar, so both produce the same text.
+        """
+
+        tokens = self._tokens
+        if tokens is None:
+            return ctx.getText()
+        return tokens.getText(ctx.start, ctx.stop)
 
-    @staticmethod
     def _normalize_type_clause(
-        clause: VisualBasic6Parser.AsTypeClauseContext | None,
+        self, clause: VisualBasic6Parser.AsTypeClauseContext | None
     ) -> str | None:
         if not clause:
             return None
-        text = clause.getText().strip()
+        text = self._text(clause).strip()
         if text.lower().startswith("as"):
             text = text[2:].strip()
-        return text or None
+        # Type names repeat across a code base; share one object per name.
+        return sys.intern(text) if text else None
 
     @staticmethod
     def _normalize_visibility(value: str | None) -> str | None:
         if not value:
             return None
-        return value.lower()
+        normalized = _VISIBILITY_CACHE.get(value)
+        if normalized is None:
+            normalized = _VISIBILITY_CACHE.setdefault(value, sys.intern(value.lower()))
+        return normalized
 
     @staticmethod
     def _location(ctx: ParserRuleContext) -> dict[str, int] | None:
@@ -247,77 +582,104 @@ class ModuleCollector(VisualBasic6ParserListener):
             return None
         return {"line": token.line, "column": token.column}
 
-    @staticmethod
-    def _hashable(value: Any) -> Any:
-        if isinstance(value, list):
-            return tuple(ModuleCollector._hashable(v) for v in value)
-        if isinstance(value, dict):
-            return tuple(
-                sorted((k, ModuleCollector._hashable(v)) for k, v in value.items())
-            )
-        return value
+
+# Context type -> unbound `exit*` handler, built once at import time.
+_HANDLERS: Final[dict[type, Callable[[ModuleCollector, Any], None]]] = {
+    VisualBasic6Parser.ModuleHeaderContext: ModuleCollector.exitModuleHeader,
+    VisualBasic6Parser.AttributeStmtContext: ModuleCollector.exitAttributeStmt,
+    VisualBasic6Parser.OptionBaseStmtContext: ModuleCollector.exitOptionBaseStmt,
+    VisualBasic6Parser.OptionCompareStmtContext: (
+        ModuleCollector.exitOptionCompareStmt
+    ),
+    VisualBasic6Parser.OptionExplicitStmtContext: (
+        ModuleCollector.exitOptionExplicitStmt
+    ),
+    VisualBasic6Parser.OptionPrivateModuleStmtContext: (
+        ModuleCollector.exitOptionPrivateModuleStmt
+    ),
+    VisualBasic6Parser.SubStmtContext: ModuleCollector.exitSubStmt,
+    VisualBasic6Parser.FunctionStmtContext: ModuleCollector.exitFunctionStmt,
+    VisualBasic6Parser.PropertyGetStmtContext: ModuleCollector.exitPropertyGetStmt,
+    VisualBasic6Parser.PropertyLetStmtContext: ModuleCollector.exitPropertyLetStmt,
+    VisualBasic6Parser.PropertySetStmtContext: ModuleCollector.exitPropertySetStmt,
+}
 
 
 class IRBuilder:
-    """Transforms raw parser output into the intermediate representation."""
+    """Transforms raw parser output into the intermediate representation.
+
+    Modules are remembered per parse tree, so handing the same output (or a
+    cached parse re-labelled for the same file) to `build` again skips the
+    tree walk. Entries go away with their tree.
+    """
+
+    def __init__(self) -> None:
+        self._built: weakref.WeakKeyDictionary[
+            ParserRuleContext,
+            tuple[Path, str | None, CommonTokenStream | None, IRModule],
+        ] = weakref.WeakKeyDictionary()
 
     def build(self, output: ParserOutput) -> IRModule:
         """Translate a single parser output into an IR module."""
 
-        body: dict[str, Any] = {"schemaVersion": DEFAULT_SCHEMA_VERSION}
-        if output.parse_tree is None:
-            module = {
-                "name": output.source_path.stem,
-                "kind": self._infer_module_kind(output.source_path, None, False),
-                "attributes": [],
-                "options": [],
-                "members": [],
-            }
-            body["module"] = module
+        tree = output.parse_tree
+        if tree is None:
             return IRModule(
                 source_path=output.source_path,
-                body=body,
+                module=ModuleRecord(
+                    name=output.source_path.stem,
+                    kind=self._infer_module_kind(output, None, False),
+                ),
                 diagnostics=output.diagnostics,
             )
 
-        collector = ModuleCollector(output.source_path)
-        walker = ParseTreeWalker()
-        walker.walk(collector, output.parse_tree)
+        cached = self._built.get(tree)
+        if (
+            cached is not None
+            and cached[0] == output.source_path
+            and cached[1] == output.kind
+            and cached[2] is output.token_stream
+        ):
+            return cached[3]
 
-        module_kind = self._infer_module_kind(
-            output.source_path, collector.header_kind, collector.is_private_module
+        collector = ModuleCollector(
+            output.source_path, output.token_stream, output.preamble
         )
-        module_name = collector.module_name or output.source_path.stem
-        module_payload: dict[str, Any] = {
-            "name": module_name,
-            "kind": module_kind,
-            "attributes": collector.attributes,
-            "options": collector.options,
-            "members": collector.members,
-            "isPrivateModule": collector.is_private_module,
-        }
-        if collector.module_version is not None:
-            module_payload["version"] = collector.module_version
+        collector.collect(tree)
 
-        body["module"] = module_payload
-        return IRModule(
-            source_path=output.source_path, body=body, diagnostics=output.diagnostics
+        module_kind = self._infer_module_kind(
+            output, collector.header_kind, collector.is_private_module
+        )
+        module = ModuleRecord(
+            name=collector.module_name or output.source_path.stem,
+            kind=module_kind,
+            attributes=collector.attributes,
+            options=collector.options,
+            members=collector.members,
+            is_private_module=collector.is_private_module,
+            version=collector.module_version,
         )
+        ir_module = IRModule(
+            source_path=output.source_path,
+            module=module,
+            diagnostics=output.diagnostics,
+        )
+        self._built[tree] = (
+            output.source_path,
+            output.kind,
+            output.token_stream,
+            ir_module,
+        )
+        return ir_module
 
     @staticmethod
     def _infer_module_kind(
-        path: Path, header_kind: str | None, is_private: bool
+        output: ParserOutput, header_kind: str | None, is_private: bool
     ) -> str:
         if header_kind:
             return header_kind
-        suffix = path.suffix.lower()
-        mapping = {
-            ".bas": "standard",
-            ".cls": "class",
-            ".frm": "form",
-            ".ctl": "control",
-        }
-        kind = mapping.get(suffix, "standard")
-        if kind == "standard" and is_private:
-            return "privateModule"
+        # Jobs built by the service carry the suffix kind already.
+        kind = output.kind or module_kind_for(output.source_path)
+        if is_private and kind == DEFAULT_MODULE_KIND:
+            return _KIND_PRIVATE_MODULE
         return kind
@@ -0,0 +1,52 @@
+"""Name-indexable member list returned in built IR modules.
+
+Kept apart from `builder` because mypyc cannot compile subclasses of most
+builtin types; this module always runs interpreted.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class MembersView(list):  # type: ignore[type-arg]
+    """List of member dictionaries that can also be indexed by member name.
+
+    It serializes exactly like the plain list it replaces. String keys, for
+    both indexing and `in`, match case-insensitively as VB6 identifiers do,
+    and resolve to the first member declared with that name (a `Property Get`
+    before its `Let`). The name index is built on first lookup; treat the
+    view as read-only.
+    """
+
+    _index: dict[str, dict[str, Any]] | None = None
+    _indexed_length = -1
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, str):
+            return list.__getitem__(self, key)
+        try:
+            return self._name_index()[key.lower()]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            return key.lower() in self._name_index()
+        return list.__contains__(self, key)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the member called `name`, or `default` if there is none."""
+
+        return self._name_index().get(name.lower(), default)
+
+    def _name_index(self) -> dict[str, dict[str, Any]]:
+        if self._index is None or self._indexed_length != len(self):
+            index: dict[str, dict[str, Any]] = {}
+            for member in self:
+                name = member.get("name")
+                if name:
+                    index.setdefault(name.lower(), member)
+            self._index = index
+            self._indexed_length = len(self)
+        return self._index
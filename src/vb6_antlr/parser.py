@@ -2,20 +2,43 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
-from antlr4 import CommonTokenStream, InputStream, ParserRuleContext  # type: ignore[import]
+from antlr4 import (  # type: ignore[import]
+    BailErrorStrategy,
+    CommonTokenStream,
+    InputStream,
+    ParserRuleContext,
+    PredictionMode,
+    Token,
+)
 from antlr4.error.ErrorListener import ErrorListener  # type: ignore[import]
-from antlr4.error.Errors import RecognitionException  # type: ignore[import]
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy  # type: ignore[import]
+from antlr4.error.Errors import (  # type: ignore[import]
+    ParseCancellationException,
+    RecognitionException,
+)
+from antlr4.ListTokenSource import ListTokenSource  # type: ignore[import]
 
 from vb6_grammar.grammars.VisualBasic6Lexer import VisualBasic6Lexer  # type: ignore[import]
 from vb6_grammar.grammars.VisualBasic6Parser import VisualBasic6Parser  # type: ignore[import]
 
-from .config import ConverterConfig
+from . import _ast_cache
+from .config import ConverterConfig, module_kind_for
 from .diagnostics import Diagnostic, Severity
 
+if TYPE_CHECKING:
+    from .ir import IRModule
+
 
 @dataclass(slots=True)
 class ParseJob:
@@ -23,15 +46,53 @@ class ParseJob:
 
     source_path: Path
     text: str
+    kind: str | None = None
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
+class PreambleAttribute:
+    """An `Attribute VB_Name = "..."` line read ahead of the ANTLR parse."""
+
+    name: str
+    literal: str
+    line: int
+    column: int
+    raw: str
+
+
+@dataclass(frozen=True, slots=True)
+class PreambleOption:
+    """An `Option Explicit` / `Option Compare` line read ahead of the parse."""
+
+    option_type: str
+    value: str | bool
+    line: int
+    column: int
+
+
+@dataclass(frozen=True, slots=True)
+class Preamble:
+    """Leading module directives that were blanked out before lexing."""
+
+    attributes: tuple[PreambleAttribute, ...]
+    options: tuple[PreambleOption, ...]
+
+
+@dataclass(frozen=True, slots=True)
 class ParserOutput:
-    """Lightweight wrapper for parser results awaiting IR construction."""
+    """Lightweight wrapper for parser results awaiting IR construction.
+
+    `preamble` is only set by runtimes built with `extract_preamble=True`.
+    Those directives are then not in `parse_tree`; the IR builder merges them
+    back in front of what the tree yields.
+    """
 
     source_path: Path
     parse_tree: ParserRuleContext | None
-    diagnostics: list[Diagnostic]
+    diagnostics: tuple[Diagnostic, ...]
+    token_stream: CommonTokenStream | None = None
+    kind: str | None = None
+    preamble: Preamble | None = None
 
 
 class CollectingErrorListener(ErrorListener):
@@ -63,64 +124,508 @@ class CollectingErrorListener(ErrorListener):
         )
 
 
+class ParserRuntime:
+    """Lexer/parser pair reused across parse jobs.
+
+    The generated recognizers already share their ATN, decision DFAs and
+    prediction context cache at class level; keeping one instance of each
+    avoids rebuilding the simulators and listener plumbing for every file.
+    Instances are not thread-safe.
+
+    With `extract_preamble`, a leading `Attribute VB_Name` / `Option` block
+    is read with a regex and blanked out before lexing (see `Preamble`). It
+    is off by default because the directives then no longer appear in
+    `ParserOutput.parse_tree`.
+    """
+
+    def __init__(self, *, extract_preamble: bool = False) -> None:
+        self._extract_preamble = extract_preamble
+        self._lexer = VisualBasic6Lexer(InputStream(""))
+        self._parser = VisualBasic6Parser(CommonTokenStream(self._lexer))
+        self._parser.buildParseTrees = True
+        self._bail_strategy = BailErrorStrategy()
+        self._recovery_strategy = DefaultErrorStrategy()
+
+    def parse(self, job: ParseJob, *, metadata_only: bool = False) -> ParserOutput:
+        """Run the lexer and parser over a single job.
+
+        With `metadata_only`, routine bodies are dropped from the token stream
+        before parsing; the tree then carries module metadata and routine
+        headers only. Inputs the reduced parse rejects get a full parse.
+        Syntax errors confined to routine bodies are therefore not reported:
+        the reduced parse never sees those tokens, and it may keep routines
+        that a full parse would lose to error recovery.
+        """
+
+        split = _split_preamble(job.text) if self._extract_preamble else None
+        if split is not None:
+            preamble, remainder = split
+            output = self._parse_text(job, remainder, metadata_only)
+            # Only a clean parse is known to match the full one; anything
+            # else is re-parsed whole so diagnostics read exactly the same.
+            if output.parse_tree is not None and not output.diagnostics:
+                return replace(output, preamble=preamble)
+        return self._parse_text(job, job.text, metadata_only)
+
+    def _parse_text(
+        self, job: ParseJob, text: str, metadata_only: bool
+    ) -> ParserOutput:
+        lexer_listener = CollectingErrorListener(job.source_path)
+        parser_listener = CollectingErrorListener(job.source_path)
+
+        lexer = self._lexer
+        # Assigning the stream resets lexer state for the new input.
+        lexer.inputStream = InputStream(text)
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(lexer_listener)
+
+        token_stream = CommonTokenStream(lexer)
+        parser = self._parser
+
+        try:
+            tree = self._parse_headers(token_stream) if metadata_only else None
+            if tree is None:
+                parser.setTokenStream(token_stream)
+                tree = self._start_rule(parser_listener)
+        except RecognitionException as exc:  # pragma: no cover - defensive guard
+            parser_listener.syntaxError(
+                parser, None, exc.line, exc.column, exc.msg or str(exc), exc
+            )
+            tree = None
+        except Exception as exc:  # pragma: no cover - defensive guard
+            parser_listener.diagnostics.append(
+                Diagnostic(
+                    severity="error",
+                    message=str(exc),
+                    source_path=job.source_path,
+                )
+            )
+            tree = None
+
+        diagnostics = (*lexer_listener.diagnostics, *parser_listener.diagnostics)
+        return ParserOutput(
+            source_path=job.source_path,
+            parse_tree=tree,
+            diagnostics=diagnostics,
+            # The stream actually parsed; body-stripped in metadata-only mode.
+            token_stream=parser.getTokenStream() if tree is not None else None,
+            kind=job.kind,
+        )
+
+    def _start_rule(
+        self, listener: CollectingErrorListener
+    ) -> VisualBasic6Parser.StartRuleContext:
+        """Parse with SLL prediction, retrying in full LL mode on failure.
+
+        SLL accepts nearly all valid input at a fraction of the cost. When it
+        bails, the token stream is rewound and parsed again with LL prediction
+        and error recovery; only that pass reports diagnostics.
+        """
+
+        parser = self._parser
+        tree = self._try_sll()
+        if tree is not None:
+            return tree
+
+        parser._errHandler = self._recovery_strategy
+        parser._interp.predictionMode = PredictionMode.LL
+        parser.reset()
+        parser.addErrorListener(listener)
+        return parser.startRule()
+
+    def _parse_headers(
+        self, token_stream: CommonTokenStream
+    ) -> VisualBasic6Parser.StartRuleContext | None:
+        """Parse only routine headers; returns None when SLL rejects them."""
+
+        token_stream.fill()
+        headers = _strip_routine_bodies(token_stream.tokens)
+        self._parser.setTokenStream(CommonTokenStream(ListTokenSource(headers)))
+        return self._try_sll()
+
+    def _try_sll(self) -> VisualBasic6Parser.StartRuleContext | None:
+        parser = self._parser
+        parser.removeErrorListeners()
+        parser._errHandler = self._bail_strategy
+        parser._interp.predictionMode = PredictionMode.SLL
+        try:
+            return parser.startRule()
+        except ParseCancellationException:
+            return None
+
+    @property
+    def extract_preamble(self) -> bool:
+        return self._extract_preamble
+
+
 class VB6ParserService:
     """Coordinates lexer/parser invocations and collects diagnostics."""
 
-    def __init__(self, config: ConverterConfig) -> None:
+    def __init__(
+        self, config: ConverterConfig, runtime: ParserRuntime | None = None
+    ) -> None:
         self._config = config
+        # An injected runtime is used for in-process parsing; worker
+        # processes always build their own.
+        self._runtime = runtime
 
     def build_jobs(self, inputs: Iterable[Path] | None = None) -> list[ParseJob]:
         """Prepare parse jobs from disk or pre-supplied sources."""
 
         paths = list(inputs) if inputs is not None else self._config.resolve_inputs()
-        jobs: list[ParseJob] = []
-        for path in paths:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            jobs.append(ParseJob(source_path=path, text=text))
-        return jobs
+        if len(paths) <= 1:
+            texts = [_read_source(path) for path in paths]
+        else:
+            # Reads release the GIL, so a small thread pool overlaps disk I/O.
+            with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+                texts = list(executor.map(_read_source, paths))
+        return [
+            ParseJob(source_path=path, text=text, kind=module_kind_for(path))
+            for path, text in zip(paths, texts)
+        ]
 
     def parse(self, jobs: Iterable[ParseJob]) -> list[ParserOutput]:
         """Execute ANTLR parsing for the provided jobs."""
 
+        runtime = self._ensure_runtime()
+        metadata_only = self._config.metadata_only
         outputs: list[ParserOutput] = []
         for job in jobs:
-            lexer_listener = CollectingErrorListener(job.source_path)
-            parser_listener = CollectingErrorListener(job.source_path)
-
-            input_stream = InputStream(job.text)
-            lexer = VisualBasic6Lexer(input_stream)
-            lexer.removeErrorListeners()
-            lexer.addErrorListener(lexer_listener)
-
-            token_stream = CommonTokenStream(lexer)
-            parser = VisualBasic6Parser(token_stream)
-            parser.buildParseTrees = True
-            parser.removeErrorListeners()
-            parser.addErrorListener(parser_listener)
-
-            try:
-                tree = parser.startRule()
-            except RecognitionException as exc:  # pragma: no cover - defensive guard
-                parser_listener.syntaxError(
-                    parser, None, exc.line, exc.column, exc.msg or str(exc), exc
-                )
-                tree = None
-            except Exception as exc:  # pragma: no cover - defensive guard
-                parser_listener.diagnostics.append(
-                    Diagnostic(
-                        severity="error",
-                        message=str(exc),
-                        source_path=job.source_path,
-                    )
-                )
-                tree = None
+            key = _parse_cache_key(job.text, metadata_only, runtime.extract_preamble)
+            cached = _PARSE_CACHE.get(key)
+            if cached is None:
+                output = runtime.parse(job, metadata_only=metadata_only)
+                _PARSE_CACHE.put(key, output)
+            else:
+                output = _rebind_output(cached, job)
+            outputs.append(output)
+        return outputs
 
-            diagnostics = lexer_listener.diagnostics + parser_listener.diagnostics
-            outputs.append(
-                ParserOutput(
-                    source_path=job.source_path,
-                    parse_tree=tree,
-                    diagnostics=diagnostics,
+    def parse_source(self, text: str, virtual_path: Path) -> ParserOutput:
+        """Parse in-memory source text as if it had been read from `virtual_path`.
+
+        The path only labels the output and its diagnostics, and supplies the
+        suffix-derived module kind; nothing is read from disk.
+        """
+
+        job = ParseJob(
+            source_path=virtual_path,
+            text=_normalize_newlines(text),
+            kind=module_kind_for(virtual_path),
+        )
+        return self.parse([job])[0]
+
+    def convert(self, jobs: Iterable[ParseJob]) -> list[IRModule]:
+        """Parse jobs and build their IR modules, fanning out across processes.
+
+        Parse trees do not survive pickling, so each worker builds the IR
+        itself and only the resulting `IRModule` crosses the process boundary.
+        Batches no larger than `parallel_threshold` stay in-process.
+        With `use_cache`, modules for unchanged sources come from the on-disk
+        cache instead. Results are returned in input order.
+        """
+
+        job_list = list(jobs)
+        if not self._config.use_cache:
+            return self._convert_uncached(job_list)
+
+        config = self._config
+        keys = [
+            _ast_cache.make_key(
+                job.source_path,
+                job.text,
+                metadata_only=config.metadata_only,
+                schema_version=config.schema_version,
+            )
+            for job in job_list
+        ]
+        modules: list[IRModule | None] = [_ast_cache.load(key) for key in keys]
+        misses = [index for index, module in enumerate(modules) if module is None]
+        built = self._convert_uncached([job_list[index] for index in misses])
+        for index, module in zip(misses, built):
+            _ast_cache.store(keys[index], module)
+            modules[index] = module
+        return modules  # type: ignore[return-value]
+
+    def _convert_uncached(self, job_list: list[ParseJob]) -> list[IRModule]:
+        if not job_list:
+            return []
+        config = self._config
+        metadata_only = config.metadata_only
+        # Small batches finish before a pool would even have started.
+        if len(job_list) <= config.parallel_threshold or config.max_workers == 1:
+            runtime = self._runtime or _shared_runtime(extract_preamble=True)
+            return [
+                _convert_one(job, runtime, metadata_only=metadata_only)
+                for job in job_list
+            ]
+        # Fork-based pools start every worker up front; never start idle ones.
+        workers = min(config.max_workers or os.cpu_count() or 1, len(job_list))
+        # A few chunks per worker amortize IPC while still balancing load.
+        chunksize = max(1, len(job_list) // (4 * workers))
+        convert_one = partial(_convert_one, metadata_only=metadata_only)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(convert_one, job_list, chunksize=chunksize))
+
+    def _ensure_runtime(self) -> ParserRuntime:
+        # Without an injected runtime, services share one per thread, so
+        # short-lived instances do not each warm up a new lexer and parser.
+        return self._runtime or _shared_runtime()
+
+
+class _ParseCache:
+    """Bounded, thread-safe LRU of parser outputs keyed by source content."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[
+            tuple[bytes, bool, bool], ParserOutput
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[bytes, bool, bool]) -> ParserOutput | None:
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+            return output
+
+    def put(self, key: tuple[bytes, bool, bool], output: ParserOutput) -> None:
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Parse trees are large, so only a modest number of sources is remembered.
+_PARSE_CACHE_SIZE = 256
+_PARSE_CACHE = _ParseCache(_PARSE_CACHE_SIZE)
+
+
+def _parse_cache_key(
+    text: str, metadata_only: bool, extract_preamble: bool
+) -> tuple[bytes, bool, bool]:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    # Trees parsed with and without the preamble differ, so both are keyed.
+    return digest, metadata_only, extract_preamble
+
+
+def _rebind_output(cached: ParserOutput, job: ParseJob) -> ParserOutput:
+    """Return `cached` as the result for `job`, sharing the parse tree.
+
+    Trees and token streams are only read downstream, so they are shared;
+    diagnostics are copied so each result points at its own source file.
+    """
+
+    return ParserOutput(
+        source_path=job.source_path,
+        parse_tree=cached.parse_tree,
+        diagnostics=tuple(
+            replace(diagnostic, source_path=job.source_path)
+            if diagnostic.source_path is not None
+            else replace(diagnostic)
+            for diagnostic in cached.diagnostics
+        ),
+        token_stream=cached.token_stream,
+        kind=job.kind,
+        preamble=cached.preamble,
+    )
+
+
+def _read_source(path: Path) -> str:
+    """Read a source file as bytes and decode it in one pass."""
+
+    return _normalize_newlines(path.read_bytes().decode("utf-8", errors="ignore"))
+
+
+def _normalize_newlines(text: str) -> str:
+    if "\r" in text:
+        # Match the universal-newline translation `Path.read_text` applied.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+_RUNTIMES = threading.local()
+
+
+def _shared_runtime(*, extract_preamble: bool = False) -> ParserRuntime:
+    """Return the runtime for the current thread (and process), building it once.
+
+    Runtimes are not thread-safe, so each thread gets its own. Pool workers
+    reuse theirs across every job they receive.
+    """
+
+    attribute = "preamble_runtime" if extract_preamble else "runtime"
+    runtime: ParserRuntime | None = getattr(_RUNTIMES, attribute, None)
+    if runtime is None:
+        runtime = ParserRuntime(extract_preamble=extract_preamble)
+        setattr(_RUNTIMES, attribute, runtime)
+    return runtime
+
+
+def _convert_one(
+    job: ParseJob,
+    runtime: ParserRuntime | None = None,
+    *,
+    metadata_only: bool = False,
+) -> IRModule:
+    """Parse a single job and build its IR; module-level so it pickles."""
+
+    # Imported lazily: the IR package depends on this module.
+    from .ir import IRBuilder
+
+    # Only the IR leaves this function, so the preamble fast path is safe.
+    runtime = runtime or _shared_runtime(extract_preamble=True)
+    output = runtime.parse(job, metadata_only=metadata_only)
+    return IRBuilder().build(output)
+
+
+# One preamble line: a directive or a blank line. Keywords are matched the way
+# the case-insensitive lexer tokenizes them (`OPTION EXPLICIT` is one token).
+_PREAMBLE_LINE = re.compile(
+    r"(?P<indent>[ \t]*)(?:"
+    r"(?P<attribute>attribute[ \t]+(?P<name>vb_name)[ \t]*=[ \t]*"
+    r'(?P<literal>"(?:[^"\r\n]|"")*"))'
+    r"|(?P<explicit>option explicit)"
+    r"|option compare[ \t]+(?P<compare>binary|text)"
+    r")?[ \t]*\r?\n",
+    re.IGNORECASE,
+)
+# Constructs the grammar only accepts before module attributes. If one follows
+# the preamble, blanking the preamble could make malformed input parse.
+_HEADER_ONLY_START = re.compile(r"[ \t\r\n]*(?:version|object|begin)\b", re.IGNORECASE)
+
+
+def _split_preamble(text: str) -> tuple[Preamble, str] | None:
+    """Read leading `Attribute VB_Name` and `Option` lines off `text`.
+
+    Returns the directives and `text` with their lines replaced by blank ones,
+    so line and column numbers in the remainder are unchanged. Returns None
+    when there is no such preamble.
+    """
+
+    attributes: list[PreambleAttribute] = []
+    options: list[PreambleOption] = []
+    position = end = 0
+    line = 1
+    match_line = _PREAMBLE_LINE.match
+    while (match := match_line(text, position)) is not None:
+        if match["attribute"]:
+            if options:
+                # Attributes after options belong to the module body.
+                break
+            attributes.append(
+                PreambleAttribute(
+                    name=match["name"],
+                    literal=match["literal"],
+                    line=line,
+                    column=len(match["indent"]),
+                    raw=match["attribute"],
                 )
             )
-        return outputs
+        elif match["explicit"] or match["compare"]:
+            options.append(
+                PreambleOption(
+                    option_type="explicit" if match["explicit"] else "compare",
+                    value=True if match["explicit"] else match["compare"].lower(),
+                    line=line,
+                    column=len(match["indent"]),
+                )
+            )
+        else:
+            position = match.end()
+            line += 1
+            continue
+        position = end = match.end()
+        line += 1
+    if not (attributes or options) or _HEADER_ONLY_START.match(text, end):
+        return None
+    blanked = "\n" * text.count("\n", 0, end)
+    preamble = Preamble(attributes=tuple(attributes), options=tuple(options))
+    return preamble, blanked + text[end:]
+
+
+_ROUTINE_ENDS = {
+    VisualBasic6Lexer.SUB: VisualBasic6Lexer.END_SUB,
+    VisualBasic6Lexer.FUNCTION: VisualBasic6Lexer.END_FUNCTION,
+    VisualBasic6Lexer.PROPERTY_GET: VisualBasic6Lexer.END_PROPERTY,
+    VisualBasic6Lexer.PROPERTY_LET: VisualBasic6Lexer.END_PROPERTY,
+    VisualBasic6Lexer.PROPERTY_SET: VisualBasic6Lexer.END_PROPERTY,
+}
+# Tokens that may precede SUB/FUNCTION/PROPERTY_* in a routine declaration.
+_DECLARATION_PREFIX = frozenset(
+    {
+        VisualBasic6Lexer.WS,
+        VisualBasic6Lexer.PRIVATE,
+        VisualBasic6Lexer.PUBLIC,
+        VisualBasic6Lexer.FRIEND,
+        VisualBasic6Lexer.GLOBAL,
+        VisualBasic6Lexer.STATIC,
+    }
+)
+
+
+def _strip_routine_bodies(tokens: list[Token]) -> list[Token]:
+    """Return copies of `tokens` with routine bodies removed.
+
+    Each routine keeps its header line, any `Attribute` lines of its body and
+    the matching `End` token, which is all the IR builder reads. Tokens are
+    cloned so a fallback full parse can reuse the original stream untouched.
+    """
+
+    newline, whitespace, eof = (
+        VisualBasic6Lexer.NEWLINE,
+        VisualBasic6Lexer.WS,
+        Token.EOF,
+    )
+    kept: list[Token] = []
+    count = len(tokens)
+    index = 0
+    line_start = True
+    while index < count:
+        token = tokens[index]
+        kept.append(token.clone())
+        index += 1
+        kind = token.type
+        if kind == newline:
+            line_start = True
+            continue
+        if not line_start:
+            continue
+        if kind in _DECLARATION_PREFIX:
+            continue
+        line_start = False
+        end_kind = _ROUTINE_ENDS.get(kind)
+        if end_kind is None:
+            continue
+
+        # Header: everything up to and including the terminating NEWLINE.
+        while index < count and tokens[index].type not in (newline, eof):
+            kept.append(tokens[index].clone())
+            index += 1
+        if index < count and tokens[index].type == newline:
+            kept.append(tokens[index].clone())
+            index += 1
+
+        # Body: keep Attribute lines, drop everything else up to the End token.
+        while index < count:
+            line_end = index
+            while line_end < count and tokens[line_end].type == whitespace:
+                line_end += 1
+            first = tokens[line_end].type if line_end < count else eof
+            if first in (end_kind, eof):
+                index = line_end
+                break
+            while line_end < count and tokens[line_end].type not in (newline, eof):
+                line_end += 1
+            if line_end < count and tokens[line_end].type == newline:
+                line_end += 1
+            if first == VisualBasic6Lexer.ATTRIBUTE:
+                kept.extend(t.clone() for t in tokens[index:line_end])
+            index = line_end
+    return kept
@@ -3,40 +3,150 @@
 from __future__ import annotations
 
 import json
+import queue
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
 from ..ir import IRModule
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+# Encoded payloads waiting for the writer; bounds memory on large batches.
+_WRITE_QUEUE_SIZE = 32
+# orjson writes exponents as `1e20` where the stdlib writes `1e+20`. This also
+# matches digits followed by `e` inside strings; those payloads just take the
+# stdlib path.
+_EXPONENT = re.compile(rb"[0-9][eE]")
+
 
 class JsonSerializer:
-    """Serialize IR modules into JSON strings or files."""
+    """Serialize IR modules into JSON strings or files.
+
+    With `fast_json` (the default), payloads are encoded with `orjson` when it
+    is installed and the indent is 2. Its output is kept only when it is
+    byte-identical to the stdlib's: non-ASCII text (which the stdlib escapes
+    as `\\uXXXX`), exponent floats and payloads `orjson` rejects (such as
+    integers beyond 64 bits) are encoded with the stdlib instead.
+    """
+
+    def __init__(self, *, fast_json: bool = True, workers: int | None = None) -> None:
+        self._fast_json = fast_json and orjson is not None
+        self._workers = workers
 
-    def dumps(self, module: IRModule, *, indent: int = 2) -> str:
+    def dumps(self, module: IRModule, *, indent: int | None = 2) -> str:
         """Return a JSON string for the supplied module."""
 
-        payload = {
-            "schemaVersion": module.body.get("schemaVersion", "1.0.0"),
+        return self._encode(module, indent=indent).decode("utf-8")
+
+    def to_payload(self, module: IRModule) -> dict[str, Any]:
+        """Return the JSON-ready envelope that `dumps` would encode."""
+
+        return {
+            "schemaVersion": module.schema_version,
             "source": str(module.source_path),
             "body": module.body,
             "diagnostics": [d.to_dict() for d in module.diagnostics],
         }
-        return json.dumps(payload, indent=indent)
 
     def dump_to_path(
-        self, module: IRModule, destination: Path, *, indent: int = 2
+        self, module: IRModule, destination: Path, *, indent: int | None = 2
     ) -> None:
         """Write the serialized module to disk."""
 
-        destination.write_text(self.dumps(module, indent=indent), encoding="utf-8")
+        destination.write_bytes(self._encode(module, indent=indent))
 
     def dump_many(self, modules: Iterable[IRModule], output_dir: Path) -> list[Path]:
-        """Serialize multiple modules to the provided directory."""
+        """Serialize multiple modules to the provided directory.
+
+        Modules are encoded on a thread pool and handed to a single writer
+        thread through a bounded queue, so encoding overlaps with file I/O
+        while only a fixed number of encoded payloads is held at once. Files
+        are written in input order, so when two modules share a file stem the
+        later one wins, regardless of which finished encoding first.
+        """
 
         output_dir.mkdir(parents=True, exist_ok=True)
-        written: list[Path] = []
-        for module in modules:
-            target = output_dir / f"{module.source_path.stem}.json"
-            self.dump_to_path(module, target)
-            written.append(target)
-        return written
+        pending: _WriteQueue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        errors: list[BaseException] = []
+        writer = threading.Thread(
+            target=_drain_writes, args=(pending, errors), name="json-writer"
+        )
+        writer.start()
+        targets: list[Path] = []
+        try:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                for module in modules:
+                    target = output_dir / f"{module.source_path.stem}.json"
+                    targets.append(target)
+                    # Blocks while the queue is full, throttling submission
+                    # (and so the encoders) to the writer.
+                    pending.put((target, executor.submit(self._encode, module)))
+        finally:
+            pending.put(None)
+            writer.join()
+        if errors:
+            raise errors[0]
+        return targets
+
+    def _encode(self, module: IRModule, *, indent: int | None = 2) -> bytes | bytearray:
+        """Build the output envelope and encode it in a single pass."""
+
+        payload = self.to_payload(module)
+        if self._fast_json and indent == 2:
+            try:
+                data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+            except orjson.JSONEncodeError:
+                pass
+            else:
+                if data.isascii() and _EXPONENT.search(data) is None:
+                    return data
+        return _stdlib_encode(payload, indent=indent)
+
+
+def _stdlib_encode(payload: dict[str, Any], *, indent: int | None) -> bytearray:
+    """Encode `payload` with the stdlib, straight into one byte buffer.
+
+    `json.dumps` joins every chunk into one `str` that then gets copied again
+    by `.encode()`. Extending a buffer chunk by chunk skips both
+    intermediates. Output is ASCII (`ensure_ascii`), so each chunk encodes
+    independently.
+    """
+
+    buffer = bytearray()
+    extend = buffer.extend
+    for chunk in json.JSONEncoder(indent=indent).iterencode(payload):
+        extend(chunk.encode("ascii"))
+    return buffer
+
+
+_WriteQueue = queue.Queue[tuple[Path, "Future[bytes | bytearray]"] | None]
+
+
+def _drain_writes(pending: _WriteQueue, errors: list[BaseException]) -> None:
+    """Write queued payloads in submission order until the `None` sentinel.
+
+    The first encode or write failure is recorded for `dump_many` to raise.
+    After it the queue is still drained, without writing, so a producer
+    blocked on a full queue can always finish.
+    """
+
+    while True:
+        item = pending.get()
+        if item is None:
+            return
+        if errors:
+            continue
+        target, future = item
+        try:
+            data = future.result()
+            with open(target, "wb") as handle:
+                handle.write(data)
+        except Exception as exc:
+            errors.append(exc)
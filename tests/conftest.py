@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from vb6_antlr.parser import ParserRuntime
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep CLI runs from reading or writing the user's IR cache."""
+
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home / "vb6_antlr"
+
+
+@pytest.fixture(scope="session")
+def antlr_runtime() -> ParserRuntime:
+    """One lexer/parser pair shared by every in-process parse in the suite."""
+
+    return ParserRuntime()
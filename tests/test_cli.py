@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import io
 import json
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
 
 from vb6_antlr.cli import main
+from vb6_antlr.ir import ModuleRecord
 
 
 VB_SOURCE = """Attribute VB_Name = "Module1"
@@ -12,18 +20,30 @@ End Sub
 """
 
 
-def test_cli_prints_json_when_no_output(tmp_path, capsys) -> None:
+def test_cli_prints_json_when_no_output(tmp_path) -> None:
     vb_file = tmp_path / "module.bas"
     vb_file.write_text(VB_SOURCE, encoding="utf-8")
+    out = io.StringIO()
 
-    exit_code = main([str(vb_file)])
-    captured = capsys.readouterr()
-    payload = json.loads(captured.out.strip())
+    exit_code = main([str(vb_file)], out=out)
+    payload = json.loads(out.getvalue().strip())
 
     assert exit_code == 0
     assert payload["body"]["module"]["name"] == "Module1"
 
 
+def test_cli_returns_payload_without_printing(tmp_path, capsys) -> None:
+    vb_file = tmp_path / "module.bas"
+    vb_file.write_text(VB_SOURCE, encoding="utf-8")
+
+    exit_code, payloads = main([str(vb_file)], return_payload=True)
+
+    assert exit_code == 0
+    assert capsys.readouterr().out == ""
+    assert [p["body"]["module"]["name"] for p in payloads] == ["Module1"]
+    assert payloads[0]["source"] == str(vb_file.resolve())
+
+
 def test_cli_writes_files_to_output_directory(tmp_path) -> None:
     vb_file = tmp_path / "module.bas"
     vb_file.write_text(VB_SOURCE, encoding="utf-8")
@@ -38,3 +58,96 @@ def test_cli_writes_files_to_output_directory(tmp_path) -> None:
 
     payload = json.loads(written_file.read_text(encoding="utf-8"))
     assert payload["body"]["module"]["name"] == "Module1"
+
+
+def test_cli_converts_multiple_files_in_parallel(tmp_path) -> None:
+    # More files than the default parallel threshold, so the pool is used.
+    names = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon"]
+    inputs = []
+    for name in names:
+        vb_file = tmp_path / f"{name.lower()}.bas"
+        vb_file.write_text(VB_SOURCE.replace("Module1", name), encoding="utf-8")
+        inputs.append(str(vb_file))
+
+    output_dir = tmp_path / "out"
+
+    exit_code = main([*inputs, "--output", str(output_dir), "--max-workers", "2"])
+
+    assert exit_code == 0
+    for name in names:
+        written_file = output_dir / f"{name.lower()}.json"
+        payload = json.loads(written_file.read_text(encoding="utf-8"))
+        assert payload["body"]["module"]["name"] == name
+
+
+def test_cli_help_does_not_import_antlr() -> None:
+    script = (
+        "import sys\n"
+        "from vb6_antlr.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('antlr4' in sys.modules)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_cli_reuses_cached_modules(tmp_path, capsys, isolated_cache_dir) -> None:
+    vb_file = tmp_path / "module.bas"
+    vb_file.write_text(VB_SOURCE, encoding="utf-8")
+
+    assert main([str(vb_file), "--no-cache"]) == 0
+    uncached = capsys.readouterr().out
+    assert not isolated_cache_dir.exists()
+
+    assert main([str(vb_file)]) == 0
+    first = capsys.readouterr().out
+    assert len(list(isolated_cache_dir.glob("*.pkl"))) == 1
+
+    assert main([str(vb_file)]) == 0
+    second = capsys.readouterr().out
+    assert first == second == uncached
+
+
+class _StaleRecord:
+    """Pickles like a record from a build whose constructor took fewer fields."""
+
+    def __reduce__(self):
+        return ModuleRecord, ("only-name",)
+
+
+@pytest.mark.parametrize("stale", [_StaleRecord(), {"not": "a module"}])
+def test_cli_treats_stale_cache_entries_as_misses(
+    tmp_path, capsys, isolated_cache_dir, stale
+) -> None:
+    vb_file = tmp_path / "module.bas"
+    vb_file.write_text(VB_SOURCE, encoding="utf-8")
+    assert main([str(vb_file)]) == 0
+    first = capsys.readouterr().out
+    [entry] = isolated_cache_dir.glob("*.pkl")
+    entry.write_bytes(pickle.dumps(stale))
+
+    assert main([str(vb_file)]) == 0
+    assert capsys.readouterr().out == first
+
+
+def test_cli_rejects_non_positive_max_workers(tmp_path, capsys) -> None:
+    vb_file = tmp_path / "module.bas"
+    vb_file.write_text(VB_SOURCE, encoding="utf-8")
+
+    for value in ("0", "-2"):
+        with pytest.raises(SystemExit) as excinfo:
+            main([str(vb_file), "--max-workers", value])
+        assert excinfo.value.code == 2
+        assert "must be at least 1" in capsys.readouterr().err
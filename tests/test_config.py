@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import dataclasses
+
+import pytest
 
 from vb6_antlr.config import ConverterConfig
 
@@ -24,3 +27,38 @@ def test_with_updates_returns_new_instance(tmp_path) -> None:
     assert updated is not config
     assert updated.fail_fast is True
     assert config.fail_fast is False
+
+
+def test_config_resolve_inputs_walks_directories(tmp_path) -> None:
+    nested = tmp_path / "src" / "forms"
+    nested.mkdir(parents=True)
+    module = tmp_path / "src" / "Module1.BAS"
+    form = nested / "Form1.frm"
+    for path in (module, form, nested / "notes.txt", tmp_path / ".bas"):
+        path.write_text("", encoding="utf-8")
+
+    config = ConverterConfig.from_paths([tmp_path])
+
+    assert config.resolve_inputs() == sorted([module.resolve(), form.resolve()])
+
+
+def test_config_is_frozen_and_hashable(tmp_path) -> None:
+    config = ConverterConfig.from_paths([tmp_path / "module.bas"])
+    config.extra_options["key"] = "value"
+    updated = config.with_updates(fail_fast=True)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.fail_fast = True  # type: ignore[misc]
+    assert isinstance(config.inputs, tuple)
+    assert hash(config) == hash(config.with_updates())
+    assert updated.extra_options == config.extra_options
+    assert updated.extra_options is not config.extra_options
+
+
+def test_config_rejects_non_positive_max_workers(tmp_path) -> None:
+    config = ConverterConfig.from_paths([tmp_path / "module.bas"])
+
+    for value in (0, -2):
+        with pytest.raises(ValueError, match="max_workers"):
+            config.with_updates(max_workers=value)
+    assert config.with_updates(max_workers=1).max_workers == 1
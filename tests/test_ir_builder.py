@@ -1,24 +1,24 @@
 from __future__ import annotations
 
+import dataclasses
+import pickle
+
 from vb6_antlr.config import ConverterConfig
 from vb6_antlr.ir import IRBuilder
-from vb6_antlr.parser import ParserOutput, VB6ParserService
+from vb6_antlr.parser import ParseJob, ParserOutput, ParserRuntime, VB6ParserService
 
 
-def build_ir_for(source_text: str, tmp_path):
+def build_ir_for(source_text: str, tmp_path, runtime=None, **config_updates):
     source_file = tmp_path / "module.bas"
-    source_file.write_text(source_text, encoding="utf-8")
-
-    config = ConverterConfig.from_paths([source_file])
-    service = VB6ParserService(config)
-    jobs = service.build_jobs()
-    outputs = service.parse(jobs)
+    config = ConverterConfig.from_paths([source_file]).with_updates(**config_updates)
+    service = VB6ParserService(config, runtime=runtime)
+    output = service.parse_source(source_text, source_file)
 
     builder = IRBuilder()
-    return builder.build(outputs[0])
+    return builder.build(output)
 
 
-def test_ir_builder_extracts_module_metadata(tmp_path) -> None:
+def test_ir_builder_extracts_module_metadata(tmp_path, antlr_runtime) -> None:
     ir_module = build_ir_for(
         """
 Attribute VB_Name = "SampleModule"
@@ -33,6 +33,7 @@ Public Function Bar() As Integer
 End Function
 """,
         tmp_path,
+        antlr_runtime,
     )
 
     module = ir_module.body["module"]
@@ -44,7 +45,7 @@ End Function
         if opt["type"] == "compare" and opt.get("value") == "text"
     )
 
-    members = {member["name"]: member for member in module["members"]}
+    members = module["members"]
     assert "Foo" in members
     assert "Bar" in members
 
@@ -65,7 +66,177 @@ def test_ir_builder_handles_missing_parse_tree(tmp_path) -> None:
     builder = IRBuilder()
     # Simulate parser failure with None parse tree
     output = ParserOutput(
-        source_path=tmp_path / "empty.bas", parse_tree=None, diagnostics=[]
+        source_path=tmp_path / "empty.bas", parse_tree=None, diagnostics=()
     )
     ir_module = builder.build(output)
     assert ir_module.body["module"]["members"] == []
+
+
+def test_ir_builder_prefers_job_kind_over_suffix(tmp_path) -> None:
+    builder = IRBuilder()
+    output = ParserOutput(
+        source_path=tmp_path / "widget.txt",
+        parse_tree=None,
+        diagnostics=(),
+        kind="control",
+    )
+    assert builder.build(output).body["module"]["kind"] == "control"
+
+    output = dataclasses.replace(output, kind=None)
+    assert builder.build(output).body["module"]["kind"] == "standard"
+
+
+def test_ir_builder_metadata_only_matches_full_parse(tmp_path, antlr_runtime) -> None:
+    source = """
+Attribute VB_Name = "Shapes"
+Option Explicit
+
+Public Property Get Area(ByVal scale As Double) As Double
+Attribute Area.VB_UserMemId = 0
+    Dim i As Integer
+    For i = 1 To 3
+        Area = Area + scale * i
+    Next i
+End Property
+
+Private Static Sub Reset(Optional ByVal count As Long = 10)
+    If count > 0 Then Exit Sub
+End Sub
+
+Public Sub Refresh()
+    If True Then
+        Attribute Refresh.VB_Description = "Nested"
+    End If
+End Sub
+"""
+
+    full = build_ir_for(source, tmp_path, antlr_runtime)
+    metadata_only = build_ir_for(source, tmp_path, antlr_runtime, metadata_only=True)
+
+    assert metadata_only.body == full.body
+    # Attributes are collected wherever they appear in a routine body.
+    attribute_names = [a["name"] for a in full.body["module"]["attributes"]]
+    assert "Area.VB_UserMemId" in attribute_names
+    assert "Refresh.VB_Description" in attribute_names
+
+
+def test_ir_builder_collects_routines_inside_conditional_blocks(
+    tmp_path, antlr_runtime
+) -> None:
+    ir_module = build_ir_for(
+        """Attribute VB_Name = "Platform"
+#If Win64 Then
+Public Sub Native64()
+End Sub
+#Else
+Public Sub Native32()
+End Sub
+#End If
+""",
+        tmp_path,
+        antlr_runtime,
+    )
+
+    names = [member["name"] for member in ir_module.body["module"]["members"]]
+    assert names == ["Native64", "Native32"]
+
+
+def test_ir_builder_token_slices_match_node_text(tmp_path, antlr_runtime) -> None:
+    source_file = tmp_path / "module.bas"
+    service = VB6ParserService(
+        ConverterConfig.from_paths([source_file]), runtime=antlr_runtime
+    )
+    output = service.parse_source(
+        """Attribute VB_Name = "Slices"
+Public Function Pick(Optional ByVal items As Variant = "a""b") As String
+End Function
+""",
+        source_file,
+    )
+    without_tokens = ParserOutput(
+        source_path=output.source_path,
+        parse_tree=output.parse_tree,
+        diagnostics=output.diagnostics,
+        preamble=output.preamble,
+    )
+
+    builder = IRBuilder()
+    assert output.token_stream is not None
+    assert builder.build(output).body == builder.build(without_tokens).body
+
+
+def test_ir_builder_reuses_module_for_same_parse_tree(tmp_path, antlr_runtime) -> None:
+    first_path = tmp_path / "first.bas"
+    service = VB6ParserService(
+        ConverterConfig.from_paths([first_path]), runtime=antlr_runtime
+    )
+    source = 'Attribute VB_Name = "Shared"\nPublic Sub Foo()\nEnd Sub\n'
+    first = service.parse_source(source, first_path)
+    second = service.parse_source(source, tmp_path / "second.bas")
+
+    builder = IRBuilder()
+    module = builder.build(first)
+
+    assert builder.build(first) is module
+    relabelled = builder.build(second)
+    assert relabelled is not module
+    assert relabelled.source_path == second.source_path
+    assert relabelled.body == module.body
+
+
+def test_ir_builder_members_index_by_name(tmp_path, antlr_runtime) -> None:
+    ir_module = build_ir_for(
+        """Attribute VB_Name = "Shapes"
+Public Property Get Area() As Double
+End Property
+Public Property Let Area(ByVal value As Double)
+End Property
+""",
+        tmp_path,
+        antlr_runtime,
+    )
+
+    members = ir_module.body["module"]["members"]
+    assert [m["kind"] for m in members] == ["propertyGet", "propertyLet"]
+    assert members["AREA"] is members[0]
+    assert "area" in members
+    assert members.get("Missing") is None
+
+
+def test_ir_builder_preamble_fast_path_matches_full_parse(tmp_path) -> None:
+    source = """Attribute VB_Name = "Fast""Path"
+Option Explicit
+  Option Compare Binary
+Option Base 1
+
+Public Sub Foo()
+End Sub
+"""
+    job = ParseJob(source_path=tmp_path / "fast.bas", text=source)
+    fast = ParserRuntime(extract_preamble=True).parse(job)
+    full = ParserRuntime(extract_preamble=False).parse(job)
+
+    assert fast.preamble is not None
+    assert full.preamble is None
+    builder = IRBuilder()
+    assert builder.build(fast).body == builder.build(full).body
+
+
+def test_ir_module_round_trips_through_pickle(tmp_path, antlr_runtime) -> None:
+    ir_module = build_ir_for(
+        """
+Attribute VB_Name = "Pickled"
+Option Explicit
+
+Public Function Area(ByVal width As Long) As Long
+End Function
+""".strip(),
+        tmp_path,
+        antlr_runtime,
+    )
+    ir_module.body
+
+    restored = pickle.loads(pickle.dumps(ir_module))
+
+    assert restored == ir_module
+    assert restored.body == ir_module.body
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from vb6_antlr.ir import AttributeRecord, IRModule, ModuleRecord, OptionRecord
+from vb6_antlr.serialization import JsonSerializer
+
+
+def make_module(tmp_path, value: object = 1) -> IRModule:
+    return IRModule(
+        source_path=tmp_path / "module.bas",
+        module=ModuleRecord(
+            name="Module1",
+            kind="standard",
+            options=[OptionRecord(option_type="base", value=value, location=None)],
+        ),
+    )
+
+
+def test_fast_json_matches_stdlib_output(tmp_path) -> None:
+    pytest.importorskip("orjson")
+    module = make_module(tmp_path)
+
+    fast = JsonSerializer(fast_json=True).dumps(module)
+    stdlib = JsonSerializer(fast_json=False).dumps(module)
+
+    assert json.loads(fast) == json.loads(stdlib)
+
+
+@pytest.mark.parametrize("value", ["Café ñ", "漢字", 1e20, 1.5e-07])
+def test_fast_json_output_is_byte_identical_to_stdlib(tmp_path, value) -> None:
+    pytest.importorskip("orjson")
+    module = IRModule(
+        source_path=tmp_path / "module.bas",
+        module=ModuleRecord(
+            name="Module1",
+            kind="standard",
+            attributes=[
+                AttributeRecord(
+                    name="VB_Description", values=[value], location=None, raw=""
+                )
+            ],
+        ),
+    )
+
+    fast = JsonSerializer(fast_json=True).dumps(module)
+    stdlib = JsonSerializer(fast_json=False).dumps(module)
+
+    assert fast == stdlib
+    assert fast.isascii()
+
+
+def test_fast_json_falls_back_for_large_integers(tmp_path) -> None:
+    module = make_module(tmp_path, value=2**70)
+
+    payload = json.loads(JsonSerializer(fast_json=True).dumps(module))
+
+    assert payload["body"]["module"]["options"][0]["value"] == 2**70
+
+
+def test_dump_many_writes_every_module(tmp_path) -> None:
+    modules = [
+        IRModule(
+            source_path=tmp_path / f"module{index}.bas",
+            module=ModuleRecord(name=f"Module{index}", kind="standard"),
+        )
+        for index in range(50)
+    ]
+    output_dir = tmp_path / "out"
+
+    written = JsonSerializer(workers=4).dump_many(modules, output_dir)
+
+    assert written == [output_dir / f"module{index}.json" for index in range(50)]
+    for index, path in enumerate(written):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        assert payload["body"]["module"]["name"] == f"Module{index}"
+
+
+def test_dump_many_reports_write_errors(tmp_path) -> None:
+    output_dir = tmp_path / "out"
+    (output_dir / "module.json").mkdir(parents=True)
+
+    with pytest.raises(OSError):
+        JsonSerializer().dump_many([make_module(tmp_path)], output_dir)
+
+
+def test_dump_many_writes_in_input_order(tmp_path) -> None:
+    def named(directory: str, name: str, attributes: int) -> IRModule:
+        return IRModule(
+            source_path=tmp_path / directory / "Utils.bas",
+            module=ModuleRecord(
+                name=name,
+                kind="standard",
+                attributes=[
+                    AttributeRecord(
+                        name=f"A{index}", values=[index], location=None, raw=""
+                    )
+                    for index in range(attributes)
+                ],
+            ),
+        )
+
+    # The first module takes far longer to encode; it must still not win.
+    modules = [named("projA", "Big", 20000), named("projB", "Small", 0)]
+    output_dir = tmp_path / "out"
+
+    written = JsonSerializer(workers=2).dump_many(modules, output_dir)
+
+    assert written == [output_dir / "Utils.json"] * 2
+    payload = json.loads(written[0].read_text(encoding="utf-8"))
+    assert payload["body"]["module"]["name"] == "Small"
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 
 from vb6_antlr.config import ConverterConfig
-from vb6_antlr.parser import VB6ParserService
+from vb6_antlr import parser as parser_module
+from vb6_antlr.parser import ParseJob, ParserRuntime, VB6ParserService
 
 
-def test_parser_generates_parse_tree(tmp_path) -> None:
+def test_parser_generates_parse_tree(tmp_path, antlr_runtime) -> None:
     source = tmp_path / "module.bas"
     source.write_text(
         """
@@ -19,7 +20,7 @@ End Sub
     )
 
     config = ConverterConfig.from_paths([source])
-    service = VB6ParserService(config)
+    service = VB6ParserService(config, runtime=antlr_runtime)
 
     jobs = service.build_jobs()
     outputs = service.parse(jobs)
@@ -27,4 +28,162 @@ End Sub
     assert len(outputs) == 1
     result = outputs[0]
     assert result.parse_tree is not None
-    assert result.diagnostics == []
+    assert result.diagnostics == ()
+    assert jobs[0].kind == result.kind == "standard"
+
+
+def test_parser_reuses_runtime_across_jobs(tmp_path, antlr_runtime) -> None:
+    first = tmp_path / "first.bas"
+    second = tmp_path / "second.bas"
+    first.write_text('Attribute VB_Name = "First"\n', encoding="utf-8")
+    second.write_text('Attribute VB_Name = "Second"\n', encoding="utf-8")
+
+    config = ConverterConfig.from_paths([first, second])
+    service = VB6ParserService(config, runtime=antlr_runtime)
+
+    outputs = service.parse(service.build_jobs())
+
+    assert [output.parse_tree is not None for output in outputs] == [True, True]
+    # Trees from earlier jobs keep their own token text after the reset.
+    assert '"First"' in outputs[0].parse_tree.getText()
+    assert '"Second"' in outputs[1].parse_tree.getText()
+
+
+def test_parser_reports_diagnostics_after_sll_fallback(tmp_path, antlr_runtime) -> None:
+    source = tmp_path / "broken.bas"
+    source.write_text("Public Sub Foo(\nEnd Sub\n", encoding="utf-8")
+
+    config = ConverterConfig.from_paths([source])
+    service = VB6ParserService(config, runtime=antlr_runtime)
+
+    outputs = service.parse(service.build_jobs())
+
+    diagnostics = outputs[0].diagnostics
+    assert diagnostics
+    assert all(d.severity == "error" for d in diagnostics)
+    assert diagnostics[0].source_path == source.resolve()
+
+
+def test_parser_reuses_results_for_identical_sources(tmp_path, antlr_runtime) -> None:
+    first = tmp_path / "first.bas"
+    second = tmp_path / "second.bas"
+    for source in (first, second):
+        source.write_text("Public Sub Foo(\nEnd Sub\n", encoding="utf-8")
+
+    config = ConverterConfig.from_paths([first, second])
+    service = VB6ParserService(config, runtime=antlr_runtime)
+
+    outputs = service.parse(service.build_jobs())
+
+    assert outputs[0].parse_tree is outputs[1].parse_tree
+    assert [output.source_path for output in outputs] == [
+        first.resolve(),
+        second.resolve(),
+    ]
+    assert outputs[1].diagnostics
+    assert all(d.source_path == second.resolve() for d in outputs[1].diagnostics)
+
+
+def test_parser_parses_in_memory_source(tmp_path, antlr_runtime) -> None:
+    virtual_path = tmp_path / "missing" / "broken.cls"
+    config = ConverterConfig.from_paths([])
+    service = VB6ParserService(config, runtime=antlr_runtime)
+
+    result = service.parse_source("Public Sub Foo(\r\nEnd Sub\r\n", virtual_path)
+
+    assert not virtual_path.exists()
+    assert result.source_path == virtual_path
+    assert result.kind == "class"
+    assert result.diagnostics
+    assert all(d.source_path == virtual_path for d in result.diagnostics)
+
+
+def test_services_share_the_default_runtime(tmp_path) -> None:
+    config = ConverterConfig.from_paths([tmp_path / "module.bas"])
+    first = VB6ParserService(config)
+    second = VB6ParserService(config)
+
+    assert first._ensure_runtime() is second._ensure_runtime()
+
+
+def test_parser_reparses_whole_file_when_preamble_remainder_fails(tmp_path) -> None:
+    job = ParseJob(
+        source_path=tmp_path / "broken.bas",
+        text='Attribute VB_Name = "Broken"\nOption Explicit\nSub Foo(\nEnd Sub\n',
+    )
+
+    fast = ParserRuntime(extract_preamble=True).parse(job)
+    full = ParserRuntime(extract_preamble=False).parse(job)
+
+    assert fast.preamble is None
+    assert fast.diagnostics
+    assert [d.to_dict() for d in fast.diagnostics] == [
+        d.to_dict() for d in full.diagnostics
+    ]
+
+
+def test_parser_preamble_runtime_strips_directives_from_tree(tmp_path) -> None:
+    job = ParseJob(
+        source_path=tmp_path / "stripped.bas",
+        text='Attribute VB_Name = "Stripped"\nOption Explicit\nPublic Sub Foo()\nEnd Sub\n',
+    )
+
+    output = ParserRuntime(extract_preamble=True).parse(job)
+
+    assert output.preamble is not None
+    assert [a.name for a in output.preamble.attributes] == ["VB_Name"]
+    text = output.parse_tree.getText()
+    assert "Stripped" not in text
+    assert "Explicit" not in text
+    assert "Foo" in text
+
+
+def test_parse_cache_separates_preamble_runtimes(tmp_path) -> None:
+    source = tmp_path / "mixed.bas"
+    source.write_text(
+        'Attribute VB_Name = "Mixed"\nOption Explicit\nPublic Sub Foo()\nEnd Sub\n',
+        encoding="utf-8",
+    )
+    config = ConverterConfig.from_paths([source])
+    fast = VB6ParserService(config, runtime=ParserRuntime(extract_preamble=True))
+    full = VB6ParserService(config, runtime=ParserRuntime(extract_preamble=False))
+
+    first = fast.parse(fast.build_jobs())[0]
+    second = full.parse(full.build_jobs())[0]
+
+    assert first.preamble is not None
+    assert second.preamble is None
+    assert '"Mixed"' in second.parse_tree.getText()
+
+
+def test_convert_pool_never_exceeds_batch_size(tmp_path, monkeypatch) -> None:
+    started: list[int] = []
+
+    class RecordingPool:
+        def __init__(self, max_workers: int) -> None:
+            started.append(max_workers)
+
+        def __enter__(self) -> RecordingPool:
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            return None
+
+        def map(self, function, iterable, chunksize: int = 1):
+            return map(function, iterable)
+
+    monkeypatch.setattr(parser_module, "ProcessPoolExecutor", RecordingPool)
+    jobs = [
+        ParseJob(
+            source_path=tmp_path / f"m{index}.bas", text="Public Sub Foo()\nEnd Sub\n"
+        )
+        for index in range(5)
+    ]
+    config = ConverterConfig.from_paths([tmp_path]).with_updates(
+        parallel_threshold=1, max_workers=64
+    )
+
+    modules = VB6ParserService(config).convert(jobs)
+
+    assert len(modules) == 5
+    assert started == [5]